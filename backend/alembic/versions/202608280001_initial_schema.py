@@ -0,0 +1,78 @@
+"""Initial schema: projects and endpoints
+
+Revision ID: 202608280001
+Revises:
+Create Date: 2026-08-28
+
+Matches the schema the old create_all startup hook produced. Databases
+that predate Alembic already have these tables — mark this revision as
+applied instead of running it:
+
+    alembic stamp 202608280001
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "202608280001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+project_status = sa.Enum(
+    "PENDING", "SCRAPING", "PARSING", "COMPLETED", "FAILED", name="projectstatus"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "projects",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("base_url", sa.String(2048), nullable=False),
+        sa.Column("status", project_status, nullable=False),
+        sa.Column("raw_content", sa.Text(), nullable=True),
+        sa.Column("api_name", sa.String(255), nullable=True),
+        sa.Column("api_description", sa.Text(), nullable=True),
+        sa.Column("auth_scheme", postgresql.JSONB(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("use_case", sa.Text(), nullable=True),
+        sa.Column("integration_suggestions", postgresql.JSONB(), nullable=True),
+    )
+
+    op.create_table(
+        "endpoints",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", name="endpoints_project_id_fkey"),
+            nullable=False,
+        ),
+        sa.Column("path", sa.String(1024), nullable=False),
+        sa.Column("method", sa.String(10), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("parameters", postgresql.JSONB(), nullable=True),
+        sa.Column("request_body", postgresql.JSONB(), nullable=True),
+        sa.Column("response_schema", postgresql.JSONB(), nullable=True),
+        sa.Column("tags", postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("endpoints")
+    op.drop_table("projects")
+    project_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,55 @@
+"""Add openapi_spec, cascade FK, and hot-path indexes
+
+Revision ID: 202608280002
+Revises: 202608280001
+Create Date: 2026-08-28
+
+The schema changes from the performance work: the precomputed OpenAPI
+export column, ON DELETE CASCADE on endpoints.project_id, the composite
+index behind the 24h cache lookup, and the endpoints FK index.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "202608280002"
+down_revision = "202608280001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "projects", sa.Column("openapi_spec", postgresql.JSONB(), nullable=True)
+    )
+    op.create_index(
+        "ix_projects_baseurl_status_created",
+        "projects",
+        ["base_url", "status", sa.text("created_at DESC")],
+    )
+
+    op.drop_constraint("endpoints_project_id_fkey", "endpoints", type_="foreignkey")
+    op.create_foreign_key(
+        "endpoints_project_id_fkey",
+        "endpoints",
+        "projects",
+        ["project_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index("ix_endpoints_project_id", "endpoints", ["project_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_endpoints_project_id", table_name="endpoints")
+    op.drop_constraint("endpoints_project_id_fkey", "endpoints", type_="foreignkey")
+    op.create_foreign_key(
+        "endpoints_project_id_fkey",
+        "endpoints",
+        "projects",
+        ["project_id"],
+        ["id"],
+    )
+    op.drop_index("ix_projects_baseurl_status_created", table_name="projects")
+    op.drop_column("projects", "openapi_spec")
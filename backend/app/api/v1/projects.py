@@ -1,97 +1,40 @@
+import asyncio
+import hashlib
+import io
+import json
 import logging
-from uuid import UUID
+import threading
 from datetime import datetime, timezone, timedelta
+from uuid import UUID
+
+import yaml
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse, Response
+try:
+    from yaml import CSafeDumper as YamlDumper  # libyaml C emitter, ~10x faster
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-import io
-import yaml
+from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.log_store import subscribe
+from app.core.rate_limiter import check_rate_limit, rate_limit_key
+from app.core.redis import get_redis
 from app.models.project import APIEndpoint, Project, ProjectStatus
 from app.schemas.project import ProjectCreate, ProjectResponse, ScrapeStatusResponse
-from app.services.scraper import scrape_docs
-from app.services.llm_parser import parse_documentation, suggest_integration_paths
-from app.services.codegen import generate_sdk
-from app.core.log_store import append_log, subscribe, get_logs
-from app.core.rate_limiter import check_rate_limit
+from app.services.codegen import generate_sdk, iter_sdk_chunks
+from app.services.openapi import build_openapi_spec
+from app.tasks.pipeline import scrape_and_parse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/projects", tags=["projects"])
 
-
-async def run_scrape_and_parse_job(project_id: UUID, url: str, use_case: str = ""):
-    from app.core.database import AsyncSessionLocal
-    from app.core.log_store import append_log
-
-    async with AsyncSessionLocal() as db:
-        try:
-            result = await db.execute(select(Project).where(Project.id == project_id))
-            project = result.scalar_one()
-
-            append_log(str(project_id), "🔍 Starting documentation scrape...")
-            project.status = ProjectStatus.SCRAPING
-            await db.commit()
-
-            scrape_results = await scrape_docs(url, max_pages=3)
-            append_log(str(project_id), f"✅ Scraped {len(scrape_results)} page(s) successfully")
-
-            combined_markdown = "\n\n---\n\n".join(
-                [f"# Source: {r.url}\n\n{r.markdown}" for r in scrape_results]
-            )
-            project.raw_content = combined_markdown[:50000]
-            await db.commit()
-
-            append_log(str(project_id), "🧠 Analyzing documentation with AI...")
-            project.status = ProjectStatus.PARSING
-            await db.commit()
-
-            api_schema = await parse_documentation(
-                combined_markdown, base_url=url, use_case=use_case
-            )
-            append_log(str(project_id), f"📋 Discovered {len(api_schema.endpoints)} endpoint(s)")
-
-            append_log(str(project_id), "💡 Generating integration path suggestions...")
-            suggestions = await suggest_integration_paths(api_schema, use_case)
-            project.integration_suggestions = suggestions
-            await db.commit()
-
-            append_log(str(project_id), "💾 Saving results to database...")
-            project.api_name = api_schema.api_name
-            project.api_description = api_schema.description
-            project.auth_scheme = api_schema.auth.model_dump()
-            project.use_case = use_case
-
-            for ep in api_schema.endpoints:
-                endpoint = APIEndpoint(
-                    project_id=project.id,
-                    path=ep.path,
-                    method=ep.method.upper(),
-                    summary=ep.summary,
-                    description=ep.description,
-                    parameters=[p.model_dump() for p in ep.parameters],
-                    request_body=ep.request_body,
-                    response_schema=ep.response_schema,
-                    tags=ep.tags,
-                )
-                db.add(endpoint)
-
-            project.status = ProjectStatus.COMPLETED
-            await db.commit()
-            append_log(str(project_id), "🎉 Done! SDK ready for download.")
-            append_log(str(project_id), "DONE")
-
-        except Exception as e:
-            logger.error(f"Pipeline failed for {project_id}: {e}", exc_info=True)
-            append_log(str(project_id), f"❌ Error: {str(e)}")
-            append_log(str(project_id), "FAILED")
-            result = await db.execute(select(Project).where(Project.id == project_id))
-            project = result.scalar_one_or_none()
-            if project:
-                project.status = ProjectStatus.FAILED
-                await db.commit()
+# How long a COMPLETED project is reused instead of re-scraping the same docs
+_CACHE_WINDOW = timedelta(hours=24)
 
 
 def _build_schema(project, endpoints, endpoint_override=None):
@@ -132,42 +75,91 @@ def _build_schema(project, endpoints, endpoint_override=None):
     return schema
 
 
+def _iter_slices(data: bytes, size: int = 64 * 1024):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+_SDK_STREAM_DONE = object()
+
+
+async def _stream_and_cache_sdk(schema: dict, language: str, cache_key: str):
+    """Yield SDK zip chunks as they are produced, caching the result.
+
+    Templating and deflate are CPU-bound, so the sync generator runs on a
+    worker thread and hands chunks back through a bounded queue — the event
+    loop stays free to serve other requests while the zip is built.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+    # Set when the consumer goes away (client disconnect closes this
+    # generator) so the producer thread doesn't block forever on a full
+    # queue nobody is draining.
+    stop = threading.Event()
+
+    def _produce():
+        try:
+            for chunk in iter_sdk_chunks(schema, language):
+                if stop.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+        except Exception as e:
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(e), loop).result()
+            return
+        if not stop.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(_SDK_STREAM_DONE), loop).result()
+
+    producer = loop.run_in_executor(None, _produce)
+    chunks = []
+    completed = False
+    try:
+        while True:
+            item = await queue.get()
+            if item is _SDK_STREAM_DONE:
+                completed = True
+                break
+            if isinstance(item, Exception):
+                raise item
+            chunks.append(item)
+            yield item
+    finally:
+        stop.set()
+        # Free a producer blocked mid-put; it re-checks `stop` before the
+        # next put, so one drain is enough for it to exit.
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        await producer
+        if completed:
+            try:
+                r = await get_redis()
+                await r.set(cache_key, b"".join(chunks), ex=86400)
+            except Exception as e:
+                logger.warning(f"SDK cache write failed: {e}")
+
+
 @router.get("/rate-limit-status")
 async def rate_limit_status(request: Request):
     """Returns current rate limit usage for the requesting IP."""
-    import time
-    import redis.asyncio as aioredis
-    from app.core.config import settings
-
     ip = request.client.host if request.client else "unknown"
     limit = 10
-    window_seconds = 3600
 
     try:
-        r = aioredis.from_url(settings.redis_url, decode_responses=True)
-        key = f"rate_limit:{ip}"
-        now = int(time.time())
-        window_start = now - window_seconds
-
+        r = await get_redis()
         pipe = r.pipeline()
-        pipe.zremrangebyscore(key, 0, window_start)
-        pipe.zcard(key)
-        pipe.zrange(key, 0, 0, withscores=True)  # oldest entry
-        results = await pipe.execute()
-        await r.aclose()
-
-        used = results[1]
-        oldest = results[2]
-        reset_in = window_seconds
-        if oldest:
-            oldest_ts = int(oldest[0][1])
-            reset_in = max(0, window_seconds - (now - oldest_ts))
+        pipe.get(rate_limit_key(ip))
+        pipe.ttl(rate_limit_key(ip))
+        used_raw, ttl = await pipe.execute()
 
+        used = int(used_raw or 0)
         return {
             "used": used,
             "limit": limit,
             "remaining": max(0, limit - used),
-            "reset_in_seconds": reset_in,
+            "reset_in_seconds": max(0, ttl),
         }
     except Exception as e:
         logger.warning(f"Rate limit status error: {e}")
@@ -176,16 +168,25 @@ async def rate_limit_status(request: Request):
 
 @router.get("/", response_model=list[ProjectResponse])
 async def list_projects(db: AsyncSession = Depends(get_db)):
+    # Select only the response columns — full entities would drag raw_content
+    # (the entire scraped doc) and the JSONB columns over the wire per row.
     result = await db.execute(
-        select(Project).order_by(Project.created_at.desc()).limit(20)
+        select(
+            Project.id,
+            Project.name,
+            Project.base_url,
+            Project.status,
+            Project.created_at,
+        )
+        .order_by(Project.created_at.desc())
+        .limit(20)
     )
-    return result.scalars().all()
+    return [ProjectResponse.model_validate(row._mapping) for row in result.all()]
 
 
 @router.post("/", response_model=ProjectResponse, status_code=201)
 async def create_project(
     payload: ProjectCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     request: Request = None,
 ):
@@ -198,16 +199,19 @@ async def create_project(
             headers={"Retry-After": str(retry_after)},
         )
 
-    from urllib.parse import urlparse
-    parsed = urlparse(str(payload.url))
-    api_base_url = f"{parsed.scheme}://{parsed.netloc}"
+    # HttpUrl already parsed the URL during validation — no need to re-parse.
+    # pydantic fills in the scheme's default port, so only keep explicit ones.
+    url = payload.url
+    default_port = 443 if url.scheme == "https" else 80
+    port = f":{url.port}" if url.port and url.port != default_port else ""
+    api_base_url = f"{url.scheme}://{url.host}{port}"
 
     if not payload.force_refresh:
         existing = await db.execute(
             select(Project).where(
                 Project.base_url == api_base_url,
                 Project.status == ProjectStatus.COMPLETED,
-                Project.created_at >= datetime.now(timezone.utc) - timedelta(hours=24),
+                Project.created_at >= datetime.now(timezone.utc) - _CACHE_WINDOW,
             ).order_by(Project.created_at.desc()).limit(1)
         )
         cached = existing.scalar_one_or_none()
@@ -215,7 +219,6 @@ async def create_project(
             cached.name = payload.name
             cached.use_case = payload.use_case
             await db.commit()
-            await db.refresh(cached)
             logger.info(f"Cache hit for {api_base_url} — returning project {cached.id}")
             return cached
 
@@ -226,39 +229,43 @@ async def create_project(
     )
     db.add(project)
     await db.commit()
-    await db.refresh(project)
-    background_tasks.add_task(
-        run_scrape_and_parse_job,
-        project.id,
-        str(payload.url),
-        payload.use_case,
-    )
+    scrape_and_parse.delay(str(project.id), str(payload.url), payload.use_case)
     return project
 
 
 @router.get("/{project_id}", response_model=ScrapeStatusResponse)
-async def get_project(project_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+async def get_project(project_id: UUID, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
 @router.get("/{project_id}/endpoints")
-async def get_endpoints(project_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+async def get_endpoints(project_id: UUID, db: AsyncSession = Depends(get_db)):
+    # Project only what the response renders — skips the request_body /
+    # response_schema JSONB blobs, which dominate the row weight.
+    result = await db.execute(
+        select(Project.api_name, Project.auth_scheme).where(Project.id == project_id)
+    )
+    project = result.one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     ep_result = await db.execute(
-        select(APIEndpoint).where(APIEndpoint.project_id == project_id)
+        select(
+            APIEndpoint.id,
+            APIEndpoint.method,
+            APIEndpoint.path,
+            APIEndpoint.summary,
+            APIEndpoint.parameters,
+            APIEndpoint.tags,
+        ).where(APIEndpoint.project_id == project_id)
     )
-    endpoints = ep_result.scalars().all()
+    endpoints = ep_result.all()
 
     return {
-        "project_id": project_id,
+        "project_id": str(project_id),
         "api_name": project.api_name,
         "auth": project.auth_scheme,
         "endpoint_count": len(endpoints),
@@ -277,30 +284,37 @@ async def get_endpoints(project_id: str, db: AsyncSession = Depends(get_db)):
 
 
 async def _preview_sdk_code(
-    project_id: str,
+    request: Request,
+    project_id: UUID,
     language: str,
     endpoint_override: list | None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession,
 ):
     if language not in ["python", "typescript"]:
         raise HTTPException(status_code=400, detail="Language must be 'python' or 'typescript'")
 
-    result = await db.execute(select(Project).where(Project.id == project_id))
+    # One round-trip: project + endpoints via selectinload instead of two
+    # sequential queries.
+    result = await db.execute(
+        select(Project)
+        .options(selectinload(Project.endpoints))
+        .where(Project.id == project_id)
+    )
     project = result.scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     if project.status != ProjectStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Project is not ready")
 
-    ep_result = await db.execute(
-        select(APIEndpoint).where(APIEndpoint.project_id == project_id)
-    )
-    endpoints = ep_result.scalars().all()
-    schema = _build_schema(project, endpoints, endpoint_override)
+    schema = _build_schema(project, project.endpoints, endpoint_override)
 
-    # Generate zip and extract the main client file
+    # Generate zip and extract the main client file. Generation is CPU-bound
+    # (templating + deflate), so it runs on the shared process pool.
     import zipfile
-    zip_bytes = generate_sdk(schema, language)
+    loop = asyncio.get_running_loop()
+    zip_bytes = await loop.run_in_executor(
+        request.app.state.process_pool, generate_sdk, schema, language
+    )
     with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
         # Find the main client file
         names = zf.namelist()
@@ -317,31 +331,33 @@ async def _preview_sdk_code(
 
 @router.get("/{project_id}/preview")
 async def preview_sdk_get(
-    project_id: str,
+    request: Request,
+    project_id: UUID,
     language: str = "python",
     db: AsyncSession = Depends(get_db),
 ):
     """Returns the generated SDK as plain text for in-browser preview."""
-    code = await _preview_sdk_code(project_id, language, None, db)
+    code = await _preview_sdk_code(request, project_id, language, None, db)
     return Response(content=code, media_type="text/plain")
 
 
 @router.post("/{project_id}/preview")
 async def preview_sdk_post(
-    project_id: str,
+    request: Request,
+    project_id: UUID,
     payload: dict,
     db: AsyncSession = Depends(get_db),
 ):
     """Returns preview code, optionally using edited endpoint overrides."""
     language = payload.get("language", "python")
     endpoint_override = payload.get("endpoints") or None
-    code = await _preview_sdk_code(project_id, language, endpoint_override, db)
+    code = await _preview_sdk_code(request, project_id, language, endpoint_override, db)
     return Response(content=code, media_type="text/plain")
 
 
 @router.post("/{project_id}/generate")
 async def generate_code(
-    project_id: str,
+    project_id: UUID,
     payload: dict,
     db: AsyncSession = Depends(get_db),
 ):
@@ -349,25 +365,43 @@ async def generate_code(
     if language not in ["python", "typescript"]:
         raise HTTPException(status_code=400, detail="Language must be 'python' or 'typescript'")
 
-    result = await db.execute(select(Project).where(Project.id == project_id))
+    result = await db.execute(
+        select(Project)
+        .options(selectinload(Project.endpoints))
+        .where(Project.id == project_id)
+    )
     project = result.scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     if project.status != ProjectStatus.COMPLETED:
         raise HTTPException(status_code=400, detail=f"Project is not ready (status: {project.status})")
 
-    ep_result = await db.execute(
-        select(APIEndpoint).where(APIEndpoint.project_id == project_id)
-    )
-    endpoints = ep_result.scalars().all()
     endpoint_override = payload.get("endpoints") or None
-    schema = _build_schema(project, endpoints, endpoint_override)
+    schema = _build_schema(project, project.endpoints, endpoint_override)
+
+    # SDK output is deterministic in (schema, language) — cache the zip so
+    # repeat downloads of a completed project skip templating + compression.
+    schema_hash = hashlib.sha256(
+        json.dumps(schema, sort_keys=True).encode()
+    ).hexdigest()
+    cache_key = f"sdk:{project_id}:{language}:{schema_hash}"
+
+    zip_bytes = None
+    try:
+        r = await get_redis()
+        zip_bytes = await r.get(cache_key)
+    except Exception as e:
+        logger.warning(f"SDK cache read failed (regenerating): {e}")
+
+    if zip_bytes is not None:
+        content = _iter_slices(zip_bytes)
+    else:
+        content = _stream_and_cache_sdk(schema, language, cache_key)
 
-    zip_bytes = generate_sdk(schema, language)
     filename = f"{project.api_name or 'sdk'}_{language}_sdk.zip".replace(" ", "_").lower()
 
     return StreamingResponse(
-        io.BytesIO(zip_bytes),
+        content,
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -375,69 +409,55 @@ async def generate_code(
 
 @router.get("/{project_id}/export")
 async def export_openapi(
-    project_id: str,
+    project_id: UUID,
     format: str = "json",
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    ep_result = await db.execute(
-        select(APIEndpoint).where(APIEndpoint.project_id == project_id)
-    )
-    endpoints = ep_result.scalars().all()
-
-    paths = {}
-    for ep in endpoints:
-        parameters = []
-        for p in (ep.parameters or []):
-            parameters.append({
-                "name": p["name"],
-                "in": p["location"],
-                "required": p.get("required", False),
-                "description": p.get("description", ""),
-                "schema": {"type": p.get("type", "string")}
-            })
-        paths[ep.path] = {
-            ep.method.lower(): {
-                "summary": ep.summary or "",
-                "description": ep.description or "",
-                "parameters": parameters,
-                "tags": ep.tags or [],
-                "responses": {"200": {"description": "Successful response"}}
-            }
-        }
-
-    spec = {
-        "openapi": "3.0.0",
-        "info": {
-            "title": project.api_name or project.name,
-            "version": "1.0.0",
-            "description": project.api_description or ""
-        },
-        "paths": paths,
-    }
+    # Projects completed since the precompute went in carry the spec on the
+    # row; older ones fall back to building it from the endpoints table.
+    spec = project.openapi_spec
+    if spec is None:
+        ep_result = await db.execute(
+            select(APIEndpoint).where(APIEndpoint.project_id == project_id)
+        )
+        spec = build_openapi_spec(
+            title=project.api_name or project.name,
+            description=project.api_description or "",
+            endpoints=[
+                {
+                    "path": ep.path,
+                    "method": ep.method,
+                    "summary": ep.summary,
+                    "description": ep.description,
+                    "parameters": ep.parameters,
+                    "tags": ep.tags,
+                }
+                for ep in ep_result.scalars()
+            ],
+        )
 
     if format == "yaml":
-        content = yaml.dump(spec, default_flow_style=False, sort_keys=False)
+        content = yaml.dump(spec, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
         return Response(
             content=content,
             media_type="application/yaml",
             headers={"Content-Disposition": "attachment; filename=openapi.yaml"}
         )
 
-    return JSONResponse(
+    return ORJSONResponse(
         content=spec,
         headers={"Content-Disposition": "attachment; filename=openapi.json"}
     )
 
 
 @router.get("/{project_id}/logs")
-async def stream_logs(project_id: str):
+async def stream_logs(project_id: UUID):
     return StreamingResponse(
-        subscribe(project_id),
+        subscribe(str(project_id)),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -447,27 +467,23 @@ async def stream_logs(project_id: str):
 
 
 @router.get("/{project_id}/suggestions")
-async def get_suggestions(project_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+async def get_suggestions(project_id: UUID, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return {
-        "project_id": project_id,
+        "project_id": str(project_id),
         "use_case": project.use_case,
         "suggestions": project.integration_suggestions or []
     }
 
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+async def delete_project(project_id: UUID, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    await db.execute(
-        APIEndpoint.__table__.delete().where(APIEndpoint.project_id == project_id)
-    )
+    # Endpoint rows are removed by the FK's ON DELETE CASCADE
     await db.delete(project)
     await db.commit()
-    return {"deleted": project_id}
+    return {"deleted": str(project_id)}
@@ -1,5 +1,8 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
@@ -8,12 +11,18 @@ DATABASE_URL = settings.database_url.replace(
     "postgresql://", "postgresql+asyncpg://"
 )
 
-engine = create_async_engine(DATABASE_URL, echo=settings.debug)
-
-AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.debug,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
 )
 
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
@@ -24,4 +33,23 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+@asynccontextmanager
+async def worker_session():
+    """Session for Celery tasks.
+
+    Each task runs under its own asyncio.run loop (and workers may fork), so
+    pooled connections cannot be carried across invocations — use NullPool and
+    dispose the engine when the task finishes.
+    """
+    worker_engine = create_async_engine(
+        DATABASE_URL, echo=settings.debug, poolclass=NullPool
+    )
+    factory = async_sessionmaker(worker_engine, expire_on_commit=False)
+    try:
+        async with factory() as session:
+            yield session
+    finally:
+        await worker_engine.dispose()
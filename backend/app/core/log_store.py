@@ -1,40 +1,215 @@
 import asyncio
-from collections import defaultdict
+import logging
+from collections import defaultdict, deque
 from typing import AsyncGenerator
 
-# In-memory log store: project_id -> list of log messages
-_logs: dict[str, list[str]] = defaultdict(list)
-_listeners: dict[str, list[asyncio.Queue]] = defaultdict(list)
+from app.core.redis import get_redis
 
+logger = logging.getLogger(__name__)
 
-def append_log(project_id: str, message: str):
-    """Add a log message for a project."""
+HISTORY_LIMIT = 500
+# How long logs stay readable after a project reaches a terminal state
+HISTORY_TTL = 86400
+LOCAL_RETENTION_SECONDS = 300
+# How many historical lines a (re)connecting SSE client gets replayed —
+# enough to repaint the progress view without re-sending the whole run.
+REPLAY_LIMIT = 100
+TERMINAL_MESSAGES = ("DONE", "FAILED")
+_TERMINAL_FRAMES = (b"DONE", b"FAILED")
+
+
+def _history_key(project_id: str) -> str:
+    return f"logs:{project_id}:history"
+
+
+def _channel(project_id: str) -> str:
+    return f"logs:{project_id}"
+
+
+# In-memory fallback, only used when Redis is unreachable. Logs kept here are
+# visible to the local process only; the deque bounds each project's history
+# and terminal projects are dropped entirely after a grace period. Fan-out is
+# a single broadcast Event per project — append is O(1) regardless of
+# subscriber count, and each subscriber tracks how much it has consumed.
+_logs: dict[str, deque[str]] = defaultdict(lambda: deque(maxlen=HISTORY_LIMIT))
+_events: dict[str, asyncio.Event] = {}
+_appended: dict[str, int] = defaultdict(int)
+
+
+def _append_local(project_id: str, message: str):
     _logs[project_id].append(message)
-    for queue in _listeners[project_id]:
-        queue.put_nowait(message)
+    _appended[project_id] += 1
+    # Wake every waiting subscriber with one set; arm a fresh event for the
+    # next append.
+    event = _events.get(project_id)
+    _events[project_id] = asyncio.Event()
+    if event is not None:
+        event.set()
+    if message in TERMINAL_MESSAGES:
+        _schedule_local_cleanup(project_id)
 
 
-def get_logs(project_id: str) -> list[str]:
-    return _logs.get(project_id, [])
+def _schedule_local_cleanup(project_id: str):
+    def _cleanup():
+        _logs.pop(project_id, None)
+        _appended.pop(project_id, None)
+        event = _events.pop(project_id, None)
+        if event is not None:
+            event.set()
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    loop.call_later(LOCAL_RETENTION_SECONDS, _cleanup)
 
 
-async def subscribe(project_id: str) -> AsyncGenerator[str, None]:
-    """Stream log messages for a project as SSE."""
-    queue: asyncio.Queue = asyncio.Queue()
-    _listeners[project_id].append(queue)
-    
-    # Send existing logs first
-    for log in _logs.get(project_id, []):
-        yield f"data: {log}\n\n"
-    
+async def append_log(project_id: str, message: str):
+    """Record a log line and fan it out to SSE subscribers.
+
+    Publishes via Redis so subscribers on any worker process see the message;
+    history is kept in a capped Redis list for replay on (re)connect. Fails
+    open to the in-process store if Redis is down.
+    """
     try:
+        r = await get_redis()
+        pipe = r.pipeline()
+        pipe.rpush(_history_key(project_id), message)
+        pipe.ltrim(_history_key(project_id), -HISTORY_LIMIT, -1)
+        pipe.publish(_channel(project_id), message)
+        if message in TERMINAL_MESSAGES:
+            pipe.expire(_history_key(project_id), HISTORY_TTL)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Redis log append failed (using in-memory store): {e}")
+        _append_local(project_id, message)
+
+
+class LogBuffer:
+    """Collects log lines and flushes them to Redis in one pipeline.
+
+    Each line is still published individually so SSE clients see every
+    message, but the RPUSH/PUBLISH round-trips are batched. Flushes
+    automatically after max_pending lines and on context exit; callers flush
+    explicitly before long-running awaits so buffered lines aren't delayed.
+    """
+
+    def __init__(self, project_id: str, max_pending: int = 8):
+        self.project_id = project_id
+        self.max_pending = max_pending
+        self._pending: list[str] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.flush()
+
+    async def log(self, message: str):
+        self._pending.append(message)
+        if len(self._pending) >= self.max_pending:
+            await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        msgs, self._pending = self._pending, []
+        try:
+            r = await get_redis()
+            pipe = r.pipeline()
+            key = _history_key(self.project_id)
+            pipe.rpush(key, *msgs)
+            pipe.ltrim(key, -HISTORY_LIMIT, -1)
+            for m in msgs:
+                pipe.publish(_channel(self.project_id), m)
+            if any(m in TERMINAL_MESSAGES for m in msgs):
+                pipe.expire(key, HISTORY_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis log flush failed (using in-memory store): {e}")
+            for m in msgs:
+                _append_local(self.project_id, m)
+
+
+async def get_logs(project_id: str) -> list[str]:
+    try:
+        r = await get_redis()
+        raw = await r.lrange(_history_key(project_id), 0, -1)
+        return [m.decode() for m in raw]
+    except Exception:
+        return list(_logs.get(project_id, ()))
+
+
+async def subscribe(project_id: str) -> AsyncGenerator[bytes, None]:
+    """Stream log messages for a project as SSE byte frames."""
+    try:
+        r = await get_redis()
+        pubsub = r.pubsub()
+        await pubsub.subscribe(_channel(project_id))
+    except Exception as e:
+        logger.warning(f"Redis subscribe failed (using in-memory store): {e}")
+        async for frame in _subscribe_local(project_id):
+            yield frame
+        return
+
+    try:
+        # Subscribe first, then replay history, so nothing published in
+        # between is missed (a replayed line may rarely arrive twice).
+        # Frames are built as bytes so Starlette doesn't re-encode each
+        # chunk, and the replay goes out as a single ASGI send.
+        history = await r.lrange(_history_key(project_id), -REPLAY_LIMIT, -1)
+        if history:
+            yield b"".join(b"data: " + raw + b"\n\n" for raw in history)
+            if history[-1] in _TERMINAL_FRAMES:
+                return
         while True:
-            try:
-                message = await asyncio.wait_for(queue.get(), timeout=30.0)
-                yield f"data: {message}\n\n"
-                if message == "DONE" or message == "FAILED":
+            item = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=30.0
+            )
+            if item is None:
+                yield b"data: ping\n\n"  # keep connection alive
+                continue
+            # Coalesce whatever else is already buffered into one send —
+            # bursty emitters (pipelined flushes) otherwise cost one ASGI
+            # send per line.
+            frames = [b"data: " + item["data"] + b"\n\n"]
+            terminal = item["data"] in _TERMINAL_FRAMES
+            while not terminal:
+                nxt = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=0
+                )
+                if nxt is None:
                     break
-            except asyncio.TimeoutError:
-                yield f"data: ping\n\n"  # keep connection alive
+                frames.append(b"data: " + nxt["data"] + b"\n\n")
+                terminal = nxt["data"] in _TERMINAL_FRAMES
+            yield b"".join(frames)
+            if terminal:
+                break
     finally:
-        _listeners[project_id].remove(queue)
\ No newline at end of file
+        await pubsub.aclose()
+
+
+async def _subscribe_local(project_id: str) -> AsyncGenerator[bytes, None]:
+    """Single-process fallback stream backed by the in-memory store."""
+    # Start the cursor so the initial replay is capped like the Redis path
+    consumed = max(0, _appended.get(project_id, 0) - REPLAY_LIMIT)
+    while True:
+        # Capture the event before snapshotting so an append racing with the
+        # snapshot still wakes us immediately.
+        event = _events.setdefault(project_id, asyncio.Event())
+        snapshot = list(_logs.get(project_id, ()))
+        fresh = min(_appended.get(project_id, 0) - consumed, len(snapshot))
+        if fresh > 0:
+            consumed += fresh
+            frames = []
+            for message in snapshot[-fresh:]:
+                frames.append(f"data: {message}\n\n".encode())
+                if message in TERMINAL_MESSAGES:
+                    yield b"".join(frames)
+                    return
+            yield b"".join(frames)
+            continue
+        try:
+            await asyncio.wait_for(event.wait(), timeout=30.0)
+        except asyncio.TimeoutError:
+            yield b"data: ping\n\n"  # keep connection alive
@@ -1,44 +1,63 @@
-import time
+import hashlib
 import logging
+
 from app.core.config import settings
+from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
+# Fixed-window counter, evaluated atomically server-side: one round-trip
+# instead of the previous ZREMRANGEBYSCORE/ZCARD/ZADD/EXPIRE pipeline, and a
+# single integer per key instead of an O(limit) sorted set.
+_RATE_LIMIT_LUA = """
+local c = redis.call('INCR', KEYS[1])
+if c == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return c
+"""
+
+_script = None
+
+
+def rate_limit_key(ip: str) -> str:
+    # Fixed 8-byte digest instead of the raw address — an IPv6 literal can be
+    # ~45 chars, and shorter keys mean less Redis memory per tracked client.
+    return "rl:" + hashlib.blake2b(ip.encode(), digest_size=8).hexdigest()
+
+
+async def _get_script():
+    global _script
+    if _script is None:
+        r = await get_redis()
+        _script = r.register_script(_RATE_LIMIT_LUA)
+    return _script
+
+
 async def check_rate_limit(ip: str, limit: int = 10, window_seconds: int = 3600) -> tuple[bool, int]:
     """
     Returns (allowed, retry_after_seconds).
-    Uses Redis sliding window counter.
+    Uses a fixed-window Redis counter (INCR + EXPIRE via Lua).
     """
     try:
-        import redis.asyncio as aioredis
-        r = aioredis.from_url(settings.redis_url, decode_responses=True)
-        
-        key = f"rate_limit:{ip}"
-        now = int(time.time())
-        window_start = now - window_seconds
-        
-        pipe = r.pipeline()
-        # Remove old requests outside the window
-        pipe.zremrangebyscore(key, 0, window_start)
-        # Count requests in current window
-        pipe.zcard(key)
-        # Add current request
-        pipe.zadd(key, {str(now): now})
-        # Set expiry
-        pipe.expire(key, window_seconds)
-        results = await pipe.execute()
-        await r.aclose()
-        
-        count = results[1]  # count before adding current
-        
-        if count >= limit:
-            # Find oldest request to calculate retry_after
-            retry_after = window_seconds
-            return False, retry_after
-        
+        script = await _get_script()
+        key = rate_limit_key(ip)
+        count = await script(keys=[key], args=[window_seconds])
+
+        if settings.debug:
+            # Hashed keys aren't readable in redis-cli — keep a reverse
+            # mapping around in dev only.
+            r = await get_redis()
+            await r.set(f"rl_debug:{key[3:]}", ip, ex=window_seconds)
+
+        if count > limit:
+            r = await get_redis()
+            ttl = await r.ttl(key)
+            return False, ttl if ttl > 0 else window_seconds
+
         return True, 0
 
     except Exception as e:
         logger.warning(f"Rate limiter error (allowing request): {e}")
         # Fail open — if Redis is down, allow the request
-        return True, 0
\ No newline at end of file
+        return True, 0
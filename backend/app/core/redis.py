@@ -0,0 +1,46 @@
+import asyncio
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+# Shared client backed by a connection pool — created lazily so importing this
+# module never opens a socket. Binary-safe (no decode_responses); callers that
+# store text decode explicitly. Per-loop for the same reason as the scraper's
+# browser pool and HTTP client: Celery runs each task under its own
+# asyncio.run, and a pooled connection's response reader is registered on the
+# loop that created it — reused from a later loop, a command would block
+# forever waiting on a reader the dead loop will never run.
+_redis: aioredis.Redis | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_lock = asyncio.Lock()
+
+
+async def get_redis() -> aioredis.Redis:
+    global _redis, _loop, _lock
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        # Connections (and the lock) belong to a previous, now-closed loop —
+        # drop them and start fresh on this one.
+        _redis = None
+        _lock = asyncio.Lock()
+        _loop = loop
+    if _redis is None:
+        async with _lock:
+            if _redis is None:
+                _redis = aioredis.from_url(
+                    settings.redis_url,
+                    max_connections=50,
+                    # Bound every command so a dead peer surfaces as an error
+                    # (callers fail open) instead of a silent hang.
+                    socket_timeout=10,
+                    socket_connect_timeout=10,
+                )
+    return _redis
+
+
+async def close_redis():
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -1,14 +1,41 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.core.database import Base, engine
+from app.core.redis import close_redis
+from app.services.scraper import browser_pool, close_http_client
 from app.api.v1 import projects
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # CPU-bound work (SDK templating + compression) runs here so it can't
+    # stall the event loop or fight the GIL with request handling.
+    app.state.process_pool = ProcessPoolExecutor(max_workers=2)
+    # Schema is managed by Alembic (alembic upgrade head at deploy time);
+    # create_all stays as a dev convenience only — under gunicorn every
+    # worker would otherwise block on catalog introspection at boot.
+    if settings.debug:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield
+    app.state.process_pool.shutdown(wait=False, cancel_futures=True)
+    await browser_pool.close()
+    await close_http_client()
+    await close_redis()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Convert any API documentation URL into a ready-to-use SDK.",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,12 +47,6 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-async def startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-
 @app.get("/health")
 async def health_check():
     return {
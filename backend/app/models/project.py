@@ -1,8 +1,8 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum as PyEnum
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -20,6 +20,19 @@ class ProjectStatus(str, PyEnum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Backs the 24h cache lookup in create_project:
+        # WHERE base_url = ? AND status = ? ORDER BY created_at DESC LIMIT 1
+        # Composite over (base_url, status, created_at DESC) so the planner
+        # answers it with a single index range scan, no sort and no heap hits
+        # for the ordering.
+        Index(
+            "ix_projects_baseurl_status_created",
+            "base_url",
+            "status",
+            text("created_at DESC"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(255))
@@ -29,20 +42,43 @@ class Project(Base):
     api_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     api_description: Mapped[str | None] = mapped_column(Text, nullable=True)
     auth_scheme: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Client-side defaults so freshly-inserted instances are fully populated
+    # without a refresh round-trip; server_default kept for out-of-band inserts.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     use_case: Mapped[str | None] = mapped_column(Text, nullable=True)
     integration_suggestions: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    # OpenAPI export precomputed at pipeline completion — the endpoint data is
+    # immutable once COMPLETED, so exports become a single-row fetch.
+    openapi_spec: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
-    endpoints: Mapped[list["APIEndpoint"]] = relationship("APIEndpoint", back_populates="project", cascade="all, delete-orphan")
+    # passive_deletes: the ON DELETE CASCADE FK removes child rows in the
+    # database, so the ORM doesn't need to load and delete them one by one.
+    endpoints: Mapped[list["APIEndpoint"]] = relationship(
+        "APIEndpoint",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
 
 class APIEndpoint(Base):
     __tablename__ = "endpoints"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id"))
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), index=True
+    )
     path: Mapped[str] = mapped_column(String(1024))
     method: Mapped[str] = mapped_column(String(10))
     summary: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -1,4 +1,3 @@
-import io
 import logging
 import zipfile
 from pathlib import Path
@@ -42,11 +41,32 @@ def _get_jinja_env() -> Environment:
     return env
 
 
-def generate_sdk(schema: dict, language: str) -> bytes:
-    """
-    Generate an SDK zip file from an API schema dict.
-    Returns the zip file as bytes.
-    """
+class _ChunkWriter:
+    """Write-only file object that hands finished chunks back to the caller."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+            self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def drain(self) -> list[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def _sdk_files(schema: dict, language: str):
+    """Yield (filename, content) pairs making up the SDK archive."""
     env = _get_jinja_env()
     api_name = schema.get("api_name", "MyAPI")
     class_name = api_name.replace(" ", "").replace("-", "")
@@ -64,28 +84,47 @@ def generate_sdk(schema: dict, language: str) -> bytes:
         "endpoints": endpoints,
     }
 
-    zip_buffer = io.BytesIO()
-
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        if language == "python":
-            template = env.get_template("python_client.py.j2")
-            code = template.render(**context)
-            zf.writestr(f"{class_name.lower()}_client.py", code)
-            zf.writestr("requirements.txt", "httpx>=0.27.0\n")
-            zf.writestr("example.py", _generate_python_example(api_name, endpoints))
-            zf.writestr("README.md", _generate_readme(api_name, language, endpoints))
-
-        elif language == "typescript":
-            template = env.get_template("typescript_client.ts.j2")
-            code = template.render(**context)
-            zf.writestr(f"{class_name.lower()}_client.ts", code)
-            zf.writestr("package.json", _generate_package_json(class_name.lower()))
-            zf.writestr("example.ts", _generate_typescript_example(api_name, endpoints))
-            zf.writestr("README.md", _generate_readme(api_name, language, endpoints))
-
-    zip_buffer.seek(0)
-    logger.info(f"Generated {language} SDK for {api_name} with {len(endpoints)} endpoints")
-    return zip_buffer.read()
+    if language == "python":
+        template = env.get_template("python_client.py.j2")
+        yield f"{class_name.lower()}_client.py", template.render(**context)
+        yield "requirements.txt", "httpx>=0.27.0\n"
+        yield "example.py", _generate_python_example(api_name, endpoints)
+        yield "README.md", _generate_readme(api_name, language, endpoints)
+
+    elif language == "typescript":
+        template = env.get_template("typescript_client.ts.j2")
+        yield f"{class_name.lower()}_client.ts", template.render(**context)
+        yield "package.json", _generate_package_json(class_name.lower())
+        yield "example.ts", _generate_typescript_example(api_name, endpoints)
+        yield "README.md", _generate_readme(api_name, language, endpoints)
+
+
+def iter_sdk_chunks(schema: dict, language: str):
+    """Stream the SDK zip as byte chunks, one archive member at a time.
+
+    Avoids holding the whole zip in memory; the first chunk is available as
+    soon as the first file is rendered and compressed.
+    """
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in _sdk_files(schema, language):
+            zf.writestr(name, content)
+            yield from writer.drain()
+    # Central directory written on close
+    yield from writer.drain()
+
+
+def generate_sdk(schema: dict, language: str) -> bytes:
+    """
+    Generate an SDK zip file from an API schema dict.
+    Returns the zip file as bytes.
+    """
+    data = b"".join(iter_sdk_chunks(schema, language))
+    logger.info(
+        f"Generated {language} SDK for {schema.get('api_name', 'MyAPI')} "
+        f"with {len(schema.get('endpoints', []))} endpoints"
+    )
+    return data
 
 
 def _generate_readme(api_name: str, language: str, endpoints: list) -> str:
@@ -1,31 +1,49 @@
+import hashlib
+import io
 import json
 import logging
+import re
 from dataclasses import dataclass, field
 
 import asyncio
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover — orjson is in requirements
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover — ijson is in requirements
+    ijson = None
+
+import msgspec
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.schema import HumanMessage, SystemMessage
-from pydantic import BaseModel, Field
 
 from app.core.config import settings
+from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
 
-# --- Pydantic models for structured output ---
+# --- Structured-output models ---
+# msgspec.Struct rather than Pydantic: these are constructed hundreds of
+# times per large spec parse, and msgspec fuses JSON decode + construction
+# in C. Unknown keys in LLM output are ignored on decode. Pydantic stays at
+# the FastAPI boundary (app.schemas) only.
 
-class Parameter(BaseModel):
+class Parameter(msgspec.Struct):
     name: str
-    location: str = Field(description="query, path, header, or body")
-    type: str = Field(description="string, integer, boolean, object, array")
+    location: str = "query"  # query, path, header, or body
+    type: str = "string"  # string, integer, boolean, object, array
     required: bool = False
     description: str = ""
 
 
-class Endpoint(BaseModel):
-    path: str = Field(description="e.g. /users/{id}")
-    method: str = Field(description="GET, POST, PUT, DELETE, PATCH")
+class Endpoint(msgspec.Struct):
+    path: str  # e.g. /users/{id}
+    method: str  # GET, POST, PUT, DELETE, PATCH
     summary: str = ""
     description: str = ""
     parameters: list[Parameter] = []
@@ -34,79 +52,292 @@ class Endpoint(BaseModel):
     tags: list[str] = []
 
 
-class AuthScheme(BaseModel):
-    type: str = Field(description="bearer, api_key, oauth2, basic, or none")
+class AuthScheme(msgspec.Struct):
+    type: str = "none"  # bearer, api_key, oauth2, basic, or none
     header_name: str = ""
     description: str = ""
 
 
-class APISchema(BaseModel):
+class APISchema(msgspec.Struct):
     api_name: str = ""
     base_url: str = ""
     version: str = ""
     description: str = ""
-    auth: AuthScheme = Field(default_factory=lambda: AuthScheme(type="none"))
+    auth: AuthScheme = msgspec.field(default_factory=AuthScheme)
     endpoints: list[Endpoint] = []
 
-class IntegrationSuggestion(BaseModel):
-    approach: str = Field(description="REST or SDK")
+
+class IntegrationSuggestion(msgspec.Struct):
+    approach: str  # REST or SDK
     language: str = ""
     reasoning: str = ""
     recommended_libraries: list[str] = []
     code_snippet: str = ""
 
 
+# The system message carries everything invariant — role, output contract
+# and the full response schema — so providers that cache shared prompt
+# prefixes only re-bill/prefill the per-chunk tail.
 SYSTEM_PROMPT = """You are an expert API documentation parser.
 Your job is to extract structured API information from raw documentation text.
 You MUST respond with valid JSON only — no markdown, no explanation, no code fences.
-The JSON must conform exactly to the schema provided."""
-
-EXTRACTION_PROMPT = """Extract all API endpoints and authentication information from the documentation below.
-
-{use_case_context}
 
 Return a JSON object with this exact structure:
-{{
+{
   "api_name": "Name of the API",
   "base_url": "Base URL if mentioned",
   "version": "API version if mentioned",
   "description": "Brief description of what this API does",
-  "auth": {{
+  "auth": {
     "type": "bearer | api_key | oauth2 | basic | none",
     "header_name": "e.g. Authorization or X-API-Key",
     "description": "How to authenticate"
-  }},
+  },
   "endpoints": [
-    {{
+    {
       "path": "/endpoint/path",
       "method": "GET",
       "summary": "Short summary",
       "description": "Detailed description",
       "parameters": [
-        {{
+        {
           "name": "param_name",
           "location": "query | path | header | body",
           "type": "string | integer | boolean | object | array",
           "required": true,
           "description": "What this param does"
-        }}
+        }
       ],
-      "request_body": {{}},
-      "response_schema": {{}},
+      "request_body": {},
+      "response_schema": {},
       "tags": ["tag1"]
-    }}
+    }
   ]
-}}
+}"""
+
+# Dynamic content only, variable parts last — use case then the chunk.
+EXTRACTION_PROMPT = """Extract all API endpoints and authentication information from the documentation below.
+
+{use_case_context}
 
 Documentation:
 {content}"""
 
 
+# How many chunk extractions may be in flight at once — bounded so a large
+# doc doesn't slam the provider's rate limit all at once.
+_CHUNK_CONCURRENCY = 5
+
+# Bump when SYSTEM_PROMPT / EXTRACTION_PROMPT change so stale cached
+# extractions aren't reused against a different prompt.
+_PROMPT_VERSION = 2
+_CHUNK_CACHE_TTL = 86400
+
+
+def _chunk_cache_key(chunk: str, use_case_context: str) -> str:
+    digest = hashlib.sha256(
+        f"{_PROMPT_VERSION}|{use_case_context}|{chunk}".encode()
+    ).hexdigest()
+    return f"llm:chunk:{digest}"
+
+
+async def _chunk_cache_get(key: str) -> APISchema | None:
+    try:
+        r = await get_redis()
+        raw = await r.get(key)
+        return msgspec.json.decode(raw, type=APISchema) if raw is not None else None
+    except Exception as e:
+        logger.warning(f"Chunk cache read failed: {e}")
+        return None
+
+
+async def _chunk_cache_set(key: str, schema: APISchema):
+    try:
+        r = await get_redis()
+        await r.set(key, msgspec.json.encode(schema), ex=_CHUNK_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Chunk cache write failed: {e}")
+
+
+# Per-provider client cache; per-loop for the same reason as the scraper's
+# browser pool and HTTP client — Celery runs each task under its own
+# asyncio.run, and a client's pooled connections die with the loop that
+# created them.
+_llm_cache: dict[bool, object] = {}
+_llm_loop = None
+
+
+def _get_llm(use_groq: bool = True):
+    # Client construction builds fresh HTTP transports and credentials each
+    # time — cache per provider so concurrent chunks share connections.
+    global _llm_loop
+    loop = asyncio.get_running_loop()
+    if _llm_loop is not loop:
+        _llm_cache.clear()
+        _llm_loop = loop
+    cached = _llm_cache.get(use_groq)
+    if cached is not None:
+        return cached
+    llm = _build_llm(use_groq)
+    _llm_cache[use_groq] = llm
+    return llm
+
+
+def _build_llm(use_groq: bool):
+    if use_groq and settings.groq_api_key:
+        from langchain_groq import ChatGroq
+        logger.info("Using Groq (primary)")
+        return ChatGroq(
+            model="llama-3.3-70b-versatile",
+            api_key=settings.groq_api_key,
+            temperature=0,
+        )
+    else:
+        logger.info("Using Gemini (fallback)")
+        return ChatGoogleGenerativeAI(
+            model="gemini-2.0-flash",
+            google_api_key=settings.gemini_api_key,
+            temperature=0,
+        )
+
+
+def _extract_json_object(text: str, start: int) -> str | None:
+    """Return the balanced JSON object beginning at text[start], or None.
+
+    Counts braces with string/escape awareness — unlike a regex it can't
+    backtrack pathologically and it bounds the object exactly.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
+
+def _find_openapi_json(markdown_content: str) -> str | None:
+    """Cheap O(n) sniff for an embedded OpenAPI/Swagger JSON document."""
+    if '"paths"' not in markdown_content:
+        return None
+    marker = markdown_content.find('"openapi"')
+    if marker == -1:
+        marker = markdown_content.find('"swagger"')
+    if marker == -1:
+        return None
+    # The version key sits at the top of the spec — the nearest opening
+    # brace before it is the document root.
+    start = markdown_content.rfind("{", 0, marker)
+    if start == -1:
+        return None
+    return _extract_json_object(markdown_content, start)
+
+
+def _is_openapi_spec(spec) -> bool:
+    """Confirm the extracted object really is a spec document.
+
+    The nearest-brace heuristic can land on the wrong object — a nested
+    one when the version key isn't the document's first key, or unrelated
+    JSON in markdown that merely quotes "openapi" — and such objects still
+    parse cleanly. Require the structural markers of a real spec so a bad
+    extraction falls back to the LLM instead of yielding zero endpoints.
+    """
+    return (
+        isinstance(spec, dict)
+        and "paths" in spec
+        and ("openapi" in spec or "swagger" in spec)
+    )
+
+
+def _json_loads(raw: str | bytes):
+    # orjson parses multi-megabyte OpenAPI specs several times faster than
+    # stdlib json; its JSONDecodeError subclasses the stdlib one, so
+    # existing handlers keep working.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _strip_code_fence(raw: str) -> str:
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+    return raw.strip()
+
+
+async def _extract_chunk(
+    index: int,
+    total: int,
+    chunk: str,
+    use_case_context: str,
+    sem: asyncio.Semaphore,
+) -> APISchema | None:
+    """Run one chunk through the LLM; Groq first, Gemini on failure.
+
+    Results are cached by content hash, so a chunk that reappears in a
+    re-scrape (or on a sibling page) skips the LLM entirely.
+    """
+    cache_key = _chunk_cache_key(chunk, use_case_context)
+    cached = await _chunk_cache_get(cache_key)
+    if cached is not None:
+        logger.info(f"Chunk {index + 1}/{total} served from cache")
+        return cached
+
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=EXTRACTION_PROMPT.format(
+            content=chunk,
+            use_case_context=use_case_context,
+        )),
+    ]
+    async with sem:
+        logger.info(f"Processing chunk {index + 1}/{total}")
+        try:
+            response = await _get_llm(use_groq=True).ainvoke(messages)
+        except Exception as e:
+            logger.warning(f"Groq failed on chunk {index + 1} — retrying with Gemini: {e}")
+            try:
+                response = await _get_llm(use_groq=False).ainvoke(messages)
+            except Exception as e2:
+                logger.error(f"Gemini fallback also failed on chunk {index + 1}: {e2}")
+                return None
+    raw = _strip_code_fence(response.content)
+    try:
+        # Fused JSON decode + Struct construction in one C pass
+        schema = msgspec.json.decode(raw, type=APISchema)
+    except msgspec.DecodeError:
+        # LLMs occasionally emit loosely-typed JSON ("required": "true") —
+        # retry with lax conversion before giving up.
+        try:
+            schema = msgspec.convert(_json_loads(raw), APISchema, strict=False)
+        except Exception as e:
+            logger.error(f"JSON parse error on chunk {index + 1}: {e}")
+            return None
+    await _chunk_cache_set(cache_key, schema)
+    return schema
+
+
 def _chunk_text(text: str, max_chars: int = 6000) -> list[str]:
-    """Split large docs into chunks that fit in the LLM context window."""
+    """Hard-split text on a character budget, preferring newline boundaries."""
     if len(text) <= max_chars:
         return [text]
-    
+
     chunks = []
     while text:
         chunk = text[:max_chars]
@@ -119,25 +350,114 @@ def _chunk_text(text: str, max_chars: int = 6000) -> list[str]:
     return chunks
 
 
+_SECTION_RE = re.compile(r"^#{1,2} ", re.MULTILINE)
+
+# ~6000 tokens at the usual 4-chars-per-token approximation — large enough
+# that a typical doc page fits in one call, comfortably inside both
+# providers' context windows.
+_PACK_TARGET_CHARS = 24000
+
+
+def _pack_chunks(text: str, target_chars: int = _PACK_TARGET_CHARS) -> list[str]:
+    """Greedily pack markdown sections into as few LLM calls as possible.
+
+    Splits on top-level headings so logical sections stay intact, then packs
+    them until the budget is reached — fewer round-trips than one chunk per
+    fixed character window, and no section is cut mid-endpoint. Sections
+    bigger than the budget fall back to the plain character splitter.
+    """
+    if len(text) <= target_chars:
+        return [text]
+
+    starts = [m.start() for m in _SECTION_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    sections = [text[s:e] for s, e in zip(starts, starts[1:] + [len(text)])]
+
+    chunks: list[str] = []
+    pending: list[str] = []
+    pending_size = 0
+    for section in sections:
+        if len(section) > target_chars:
+            if pending:
+                chunks.append("".join(pending))
+                pending, pending_size = [], 0
+            chunks.extend(_chunk_text(section, max_chars=target_chars))
+            continue
+        if pending_size + len(section) > target_chars:
+            chunks.append("".join(pending))
+            pending, pending_size = [], 0
+        pending.append(section)
+        pending_size += len(section)
+    if pending:
+        chunks.append("".join(pending))
+    return chunks
+
+
 def _merge_schemas(schemas: list[APISchema]) -> APISchema:
-    """Merge multiple chunk results into a single APISchema."""
+    """Merge chunk results into one APISchema, deduping by (path, method)."""
     if not schemas:
         return APISchema()
-    
-    merged = schemas[0]
-    for schema in schemas[1:]:
-        # Merge endpoints, avoiding duplicates by path+method
-        existing = {(e.path, e.method) for e in merged.endpoints}
+
+    # Single pass — first occurrence of each (path, method) wins, matching
+    # the old behavior without rebuilding the seen-set per schema.
+    by_key: dict[tuple[str, str], Endpoint] = {}
+    for schema in schemas:
         for endpoint in schema.endpoints:
-            if (endpoint.path, endpoint.method) not in existing:
-                merged.endpoints.append(endpoint)
-                existing.add((endpoint.path, endpoint.method))
-    
-    return merged
+            by_key.setdefault((endpoint.path, endpoint.method), endpoint)
+
+    return msgspec.structs.replace(schemas[0], endpoints=list(by_key.values()))
+
+_ALLOWED_METHODS = frozenset(
+    {"GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"}
+)
+
+
+def _auth_from_security_schemes(security_schemes: dict) -> AuthScheme:
+    auth = AuthScheme(type="none")
+    for scheme_name, scheme in security_schemes.items():
+        if scheme.get("type") == "http" and scheme.get("scheme") == "bearer":
+            auth = AuthScheme(type="bearer", header_name="Authorization", description=f"Bearer token via {scheme_name}")
+        elif scheme.get("type") == "apiKey":
+            auth = AuthScheme(type="api_key", header_name=scheme.get("name", "X-API-Key"), description=f"API Key via {scheme_name}")
+        elif scheme.get("type") == "oauth2":
+            auth = AuthScheme(type="oauth2", header_name="Authorization", description=f"OAuth2 via {scheme_name}")
+    return auth
+
+
+def _endpoint_from_operation(path: str, method: str, operation: dict) -> Endpoint | None:
+    method = method.upper()
+    if method not in _ALLOWED_METHODS:
+        return None
+
+    # Struct construction does no per-field validation — fields come
+    # straight off the spec contract, with light coercions for the
+    # nullable strings specs sometimes carry.
+    parameters = [
+        Parameter(
+            name=p.get("name", ""),
+            location=p.get("in", "query"),
+            type=(p.get("schema") or {}).get("type", p.get("type", "string")),
+            required=bool(p.get("required", False)),
+            description=p.get("description") or "",
+        )
+        for p in operation.get("parameters", [])
+    ]
+    return Endpoint(
+        path=path,
+        method=method,
+        summary=operation.get("summary") or "",
+        description=operation.get("description") or "",
+        parameters=parameters,
+        request_body=operation.get("requestBody", operation.get("body", {})) or {},
+        response_schema=operation.get("responses") or {},
+        tags=operation.get("tags") or [],
+    )
+
 
 def _parse_openapi_spec(spec: dict, base_url: str) -> APISchema:
     info = spec.get("info", {})
-    
+
     # Handle both OpenAPI 3.x and Swagger 2.x base URLs
     if not base_url:
         if "servers" in spec:  # OpenAPI 3.x
@@ -146,50 +466,78 @@ def _parse_openapi_spec(spec: dict, base_url: str) -> APISchema:
             scheme = spec.get("schemes", ["https"])[0]
             base_url = f"{scheme}://{spec['host']}{spec.get('basePath', '')}"
 
-    # Auth detection — handle both formats
-    auth = AuthScheme(type="none")
-    
-    # OpenAPI 3.x
+    # Auth detection — OpenAPI 3.x first, Swagger 2.x fallback
     security_schemes = spec.get("components", {}).get("securitySchemes", {})
-    # Swagger 2.x
     if not security_schemes:
         security_schemes = spec.get("securityDefinitions", {})
-    
-    for scheme_name, scheme in security_schemes.items():
-        if scheme.get("type") == "http" and scheme.get("scheme") == "bearer":
-            auth = AuthScheme(type="bearer", header_name="Authorization", description=f"Bearer token via {scheme_name}")
-        elif scheme.get("type") == "apiKey":
-            auth = AuthScheme(type="api_key", header_name=scheme.get("name", "X-API-Key"), description=f"API Key via {scheme_name}")
-        elif scheme.get("type") == "oauth2":
-            auth = AuthScheme(type="oauth2", header_name="Authorization", description=f"OAuth2 via {scheme_name}")
+    auth = _auth_from_security_schemes(security_schemes)
 
     endpoints = []
     for path, path_item in spec.get("paths", {}).items():
         for method, operation in path_item.items():
-            if method.upper() not in ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]:
-                continue
-            
-            parameters = []
-            for p in operation.get("parameters", []):
-                schema = p.get("schema", {})
-                parameters.append(Parameter(
-                    name=p.get("name", ""),
-                    location=p.get("in", "query"),
-                    type=schema.get("type", p.get("type", "string")),
-                    required=p.get("required", False),
-                    description=p.get("description", ""),
-                ))
-            
-            endpoints.append(Endpoint(
-                path=path,
-                method=method.upper(),
-                summary=operation.get("summary", ""),
-                description=operation.get("description", ""),
-                parameters=parameters,
-                request_body=operation.get("requestBody", operation.get("body", {})),
-                response_schema=operation.get("responses", {}),
-                tags=operation.get("tags", []),
-            ))
+            endpoint = _endpoint_from_operation(path, method, operation)
+            if endpoint is not None:
+                endpoints.append(endpoint)
+
+    return APISchema(
+        api_name=info.get("title", ""),
+        base_url=base_url,
+        version=info.get("version", ""),
+        description=info.get("description", ""),
+        auth=auth,
+        endpoints=endpoints,
+    )
+
+
+# Specs above this size are stream-parsed — a fully materialized dict for a
+# multi-megabyte spec peaks at 2-3x the file size in RSS.
+_STREAM_SPEC_THRESHOLD = 1_000_000
+
+
+def _parse_openapi_spec_streaming(spec_json: str, base_url: str) -> APISchema:
+    """Parse a large spec with ijson, one path item at a time.
+
+    Makes a few extra linear scans for the small metadata sections, but
+    never holds the whole paths map (the bulk of any big spec) in memory
+    at once.
+    """
+    data = spec_json.encode()
+
+    def _first(prefix, default=None):
+        return next(ijson.items(io.BytesIO(data), prefix, use_float=True), default)
+
+    # Same wrong-object guard as the dict path — the brace heuristic can
+    # extract a non-spec object that still parses.
+    if '"paths"' not in spec_json or (
+        _first("openapi") is None and _first("swagger") is None
+    ):
+        raise ValueError("extracted JSON is not an OpenAPI document")
+
+    info = _first("info", {}) or {}
+
+    if not base_url:
+        server = _first("servers.item")
+        if server:  # OpenAPI 3.x
+            base_url = server.get("url", "")
+        else:  # Swagger 2.x
+            host = _first("host")
+            if host:
+                scheme = (_first("schemes") or ["https"])[0]
+                base_url = f"{scheme}://{host}{_first('basePath') or ''}"
+
+    security_schemes = (
+        _first("components.securitySchemes")
+        or _first("securityDefinitions")
+        or {}
+    )
+    auth = _auth_from_security_schemes(security_schemes)
+
+    endpoints = []
+    for path, path_item in ijson.kvitems(io.BytesIO(data), "paths", use_float=True):
+        for method, operation in path_item.items():
+            endpoint = _endpoint_from_operation(path, method, operation)
+            if endpoint is not None:
+                endpoints.append(endpoint)
 
     return APISchema(
         api_name=info.get("title", ""),
@@ -204,99 +552,54 @@ async def parse_documentation(markdown_content: str, base_url: str = "", use_cas
     """
     Parse API documentation. Fast path for OpenAPI specs, LLM fallback for raw HTML docs.
     """
-    import re
-
     # Fast path: detect raw OpenAPI/Swagger JSON — no LLM needed
-    json_match = re.search(r'\{[\s\S]*"(?:openapi|swagger)"[\s\S]*"paths"[\s\S]*\}', markdown_content)
-    if json_match:
+    spec_json = _find_openapi_json(markdown_content)
+    if spec_json is not None:
         logger.info("OpenAPI spec detected — parsing directly without LLM")
         try:
-            spec = json.loads(json_match.group())
+            if ijson is not None and len(spec_json) >= _STREAM_SPEC_THRESHOLD:
+                return _parse_openapi_spec_streaming(spec_json, base_url)
+            spec = _json_loads(spec_json)
+            if not _is_openapi_spec(spec):
+                raise ValueError("extracted JSON is not an OpenAPI document")
             return _parse_openapi_spec(spec, base_url)
         except Exception as e:
             logger.warning(f"Direct OpenAPI parse failed, falling back to LLM: {e}")
 
     # LLM path: for unstructured HTML/Markdown documentation
     logger.info("No OpenAPI spec detected — using LLM parser")
-    
-    def _get_llm(use_groq: bool = True):
-        if use_groq and settings.groq_api_key:
-            from langchain_groq import ChatGroq
-            logger.info("Using Groq (primary)")
-            return ChatGroq(
-                model="llama-3.3-70b-versatile",
-                api_key=settings.groq_api_key,
-                temperature=0,
-            )
-        else:
-            logger.info("Using Gemini (fallback)")
-            return ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash",
-                google_api_key=settings.gemini_api_key,
-                temperature=0,
-            )
-
-    llm = _get_llm(use_groq=True)
-
-    chunks = _chunk_text(markdown_content)
+
+    chunks = _pack_chunks(markdown_content)
     logger.info(f"Parsing {len(chunks)} chunk(s) of documentation")
 
-    schemas = []
-    use_groq = True  # start with Groq
-    
-    for i, chunk in enumerate(chunks):
-        logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-        if i > 0:
-            await asyncio.sleep(2)  # reduced from 5s since Groq is faster
-        try:
-            use_case_context = (
-                f"The developer wants to use this API for: {use_case}\n"
-                f"Focus on extracting endpoints most relevant to this use case."
-                if use_case else ""
-            )
-
-            messages = [
-                SystemMessage(content=SYSTEM_PROMPT),
-                HumanMessage(content=EXTRACTION_PROMPT.format(
-                    content=chunk,
-                    use_case_context=use_case_context
-                )),
-            ]
-            response = await llm.ainvoke(messages)
-            raw = response.content.strip()
-
-            if raw.startswith("```"):
-                raw = raw.split("```")[1]
-                if raw.startswith("json"):
-                    raw = raw[4:]
-            raw = raw.strip()
-
-            data = json.loads(raw)
-            schema = APISchema(**data)
-            schemas.append(schema)
-
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parse error on chunk {i+1}: {e}")
-        except Exception as e:
-            logger.error(f"LLM error on chunk {i+1}: {e}")
-            # If Groq failed, switch to Gemini for remaining chunks
-            if use_groq:
-                logger.warning("Groq failed — falling back to Gemini for remaining chunks")
-                use_groq = False
-                llm = _get_llm(use_groq=False)
-                # Retry this chunk with Gemini
-                try:
-                    response = await llm.ainvoke(messages)
-                    raw = response.content.strip()
-                    if raw.startswith("```"):
-                        raw = raw.split("```")[1]
-                        if raw.startswith("json"):
-                            raw = raw[4:]
-                    raw = raw.strip()
-                    data = json.loads(raw)
-                    schemas.append(APISchema(**data))
-                except Exception as e2:
-                    logger.error(f"Gemini fallback also failed on chunk {i+1}: {e2}")
+    use_case_context = (
+        f"The developer wants to use this API for: {use_case}\n"
+        f"Focus on extracting endpoints most relevant to this use case."
+        if use_case else ""
+    )
+
+    # Byte-identical chunks (shared nav or reference sections repeated
+    # across scraped pages) would each cost an LLM call — dispatch each
+    # distinct chunk once. The merge step dedupes endpoints by
+    # (path, method), so duplicates contribute nothing anyway.
+    distinct: dict[str, str] = {}
+    for chunk in chunks:
+        digest = hashlib.blake2b(chunk.encode(), digest_size=16).hexdigest()
+        distinct.setdefault(digest, chunk)
+    if len(distinct) < len(chunks):
+        logger.info(f"Skipping {len(chunks) - len(distinct)} duplicate chunk(s)")
+
+    # Chunks are independent, so extract them concurrently — wall time is
+    # one LLM round-trip (times ceil(n / concurrency)) instead of n of them
+    # with a sleep in between.
+    sem = asyncio.Semaphore(_CHUNK_CONCURRENCY)
+    results = await asyncio.gather(
+        *(
+            _extract_chunk(i, len(distinct), chunk, use_case_context, sem)
+            for i, chunk in enumerate(distinct.values())
+        )
+    )
+    schemas = [s for s in results if s is not None]
 
     merged = _merge_schemas(schemas)
     if base_url and not merged.base_url:
@@ -325,6 +628,11 @@ async def suggest_integration_paths(
     auth_type = api_schema.auth.type
     first_ep = api_schema.endpoints[0] if api_schema.endpoints else None
 
+    # Name mangling feeds every snippet — compute once instead of per use
+    name_pascal = api_schema.api_name.replace(" ", "")
+    name_lower = name_pascal.lower()
+    ep_path = first_ep.path if first_ep else ""
+
     # Build suggestions based on detected language
     suggestions = []
 
@@ -346,9 +654,9 @@ async def suggest_integration_paths(
             ) if use_case else f"Best for scripting and data pipelines.",
             "recommended_libraries": python_libs,
             "code_snippet": (
-                f"from {api_schema.api_name.replace(' ', '').lower()}_client import {api_schema.api_name.replace(' ', '')}Client\n\n"
-                f"client = {api_schema.api_name.replace(' ', '')}Client()\n"
-                f"result = client.get_{first_ep.path.strip('/').replace('/', '_')}()\n"
+                f"from {name_lower}_client import {name_pascal}Client\n\n"
+                f"client = {name_pascal}Client()\n"
+                f"result = client.get_{ep_path.strip('/').replace('/', '_')}()\n"
                 f"print(result)"
             ) if first_ep else "",
             "is_recommended": preferred_language == "python" or not preferred_language,
@@ -356,9 +664,10 @@ async def suggest_integration_paths(
 
     if preferred_language == "typescript" or preferred_language == "javascript" or not preferred_language:
         ts_libs = ["fetch API (built-in)", "axios"]
+        ts_label = "TypeScript" if "typescript" in use_case_lower else "JavaScript"
         suggestions.append({
-            "approach": f"Generated {'TypeScript' if 'typescript' in use_case_lower else 'JavaScript'} SDK",
-            "language": "TypeScript" if "typescript" in use_case_lower else "JavaScript",
+            "approach": f"Generated {ts_label} SDK",
+            "language": ts_label,
             "reasoning": (
                 f"Matches your use case: '{use_case}'. "
                 f"Perfect for Node.js bots, Express backends, and React frontends. "
@@ -366,9 +675,9 @@ async def suggest_integration_paths(
             ) if use_case else "Best for Node.js and frontend applications.",
             "recommended_libraries": ts_libs,
             "code_snippet": (
-                f"import {{ {api_schema.api_name.replace(' ', '')}Client }} from './{api_schema.api_name.replace(' ', '').lower()}_client';\n\n"
-                f"const client = new {api_schema.api_name.replace(' ', '')}Client();\n"
-                f"const result = await client.get{first_ep.path.strip('/').title()}();\n"
+                f"import {{ {name_pascal}Client }} from './{name_lower}_client';\n\n"
+                f"const client = new {name_pascal}Client();\n"
+                f"const result = await client.get{ep_path.strip('/').title()}();\n"
                 f"console.log(result);"
             ) if first_ep else "",
             "is_recommended": preferred_language in ["typescript", "javascript"],
@@ -380,7 +689,7 @@ async def suggest_integration_paths(
         "language": "Any",
         "reasoning": "Maximum flexibility. Use when you only need 1-2 endpoints or want full control over the HTTP layer.",
         "recommended_libraries": ["curl", "httpx", "fetch"],
-        "code_snippet": f"curl -X GET '{api_schema.base_url}{first_ep.path}'" if first_ep else "",
+        "code_snippet": f"curl -X GET '{api_schema.base_url}{ep_path}'" if first_ep else "",
         "is_recommended": False,
     })
 
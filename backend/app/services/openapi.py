@@ -0,0 +1,45 @@
+"""Builds the OpenAPI 3.0 export document from stored endpoint data.
+
+Lives in its own module so both the API layer (on-demand fallback) and the
+pipeline worker (precompute on completion) can share it without importing
+each other.
+"""
+
+
+def build_openapi_spec(title: str, description: str, endpoints: list[dict]) -> dict:
+    """Assemble an OpenAPI 3.0 spec dict from endpoint mappings.
+
+    Each endpoint mapping needs path / method / summary / description /
+    parameters / tags keys — the same shape as the endpoints table row.
+    """
+    paths: dict = {}
+    for ep in endpoints:
+        parameters = [
+            {
+                "name": p["name"],
+                "in": p["location"],
+                "required": p.get("required", False),
+                "description": p.get("description", ""),
+                "schema": {"type": p.get("type", "string")},
+            }
+            for p in (ep["parameters"] or [])
+        ]
+        # setdefault so GET/POST/... on the same path merge instead of the
+        # last method clobbering the earlier ones
+        paths.setdefault(ep["path"], {})[ep["method"].lower()] = {
+            "summary": ep["summary"] or "",
+            "description": ep["description"] or "",
+            "parameters": parameters,
+            "tags": ep["tags"] or [],
+            "responses": {"200": {"description": "Successful response"}},
+        }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {
+            "title": title,
+            "version": "1.0.0",
+            "description": description,
+        },
+        "paths": paths,
+    }
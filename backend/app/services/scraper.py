@@ -1,14 +1,32 @@
 import asyncio
 import logging
+from collections import deque
 from dataclasses import dataclass, field
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlsplit
 
-from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+import httpx
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from markdownify import MarkdownConverter
 from playwright.async_api import async_playwright
 
 logger = logging.getLogger(__name__)
 
+# lxml parses with C-backed libxml2, typically 3-5x faster than the pure
+# Python html.parser on big doc pages; fall back if it isn't installed.
+try:
+    BeautifulSoup("", "lxml")
+    _HTML_PARSER = "lxml"
+except FeatureNotFound:  # pragma: no cover — lxml is in requirements
+    _HTML_PARSER = "html.parser"
+
+# Builds only anchor nodes when re-parsing for link extraction
+_LINK_STRAINER = SoupStrainer("a", href=True)
+
+# Converts to Markdown (much cheaper for LLM tokens); a shared converter
+# instance fed the soup node directly, so the tree isn't serialized to a
+# string and re-tokenized by markdownify.
+_md = MarkdownConverter(heading_style="ATX", bullets="-")
+
 
 @dataclass
 class ScrapeResult:
@@ -18,25 +36,128 @@ class ScrapeResult:
     error: str | None = None
 
 
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class BrowserPool:
+    """Lazily started, shared Playwright browser.
+
+    A Chromium launch costs 500ms-1s of cold process startup — far more
+    than rendering a typical doc page. The pool starts one browser on first
+    use and hands out a fresh context per page, which keeps cookies/storage
+    isolated without paying the launch tax per URL.
+    """
+
+    def __init__(self):
+        self._pw = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+        self._loop = None
+
+    async def acquire_context(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A previous event loop owned these handles (Celery runs each
+            # task under its own asyncio.run) — they died with it. Start
+            # fresh on this loop.
+            self._pw = None
+            self._browser = None
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                self._pw = await async_playwright().start()
+                self._browser = await self._pw.chromium.launch(headless=True)
+            browser = self._browser
+        return await browser.new_context(user_agent=_USER_AGENT)
+
+    async def close(self):
+        if self._loop is not None and self._loop is not asyncio.get_running_loop():
+            # Handles from another (dead) loop can't be awaited from here;
+            # just drop the references.
+            self._pw = None
+            self._browser = None
+            self._loop = None
+            return
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._pw is not None:
+                await self._pw.stop()
+                self._pw = None
+
+
+browser_pool = BrowserPool()
+
+# Shared plain-HTTP client for the no-JS fast path; per-loop for the same
+# reason as the browser pool.
+_http_client: httpx.AsyncClient | None = None
+_http_loop = None
+
+
+async def _get_http_client() -> httpx.AsyncClient:
+    global _http_client, _http_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=10,
+            headers={"User-Agent": _USER_AGENT},
+        )
+        _http_loop = loop
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client, _http_loop
+    if _http_client is None:
+        return
+    if _http_loop is asyncio.get_running_loop():
+        await _http_client.aclose()
+    _http_client = None
+    _http_loop = None
+
+
+def _needs_js(html: str) -> bool:
+    """Heuristic: does this page render its content client-side?"""
+    if '<div id="root">' in html or '<div id="app">' in html:
+        return True
+    text = BeautifulSoup(html, _HTML_PARSER).get_text(strip=True)
+    return len(text) < 200
+
+
 async def scrape_page(url: str) -> ScrapeResult:
     """Scrape a single page and return its content as Markdown."""
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            )
-            page = await context.new_page()
-
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            html = await page.content()
-            await browser.close()
-
-        soup = BeautifulSoup(html, "html.parser")
+        # Fast path: most doc pages (Sphinx/MkDocs sites, raw OpenAPI JSON)
+        # are server-rendered — a plain GET beats a Chromium render by an
+        # order of magnitude. Fall back to the browser for SPA shells.
+        html = None
+        try:
+            client = await _get_http_client()
+            resp = await client.get(url)
+            resp.raise_for_status()
+            if not _needs_js(resp.text):
+                html = resp.text
+        except Exception as e:
+            logger.debug(f"Plain fetch failed for {url}, rendering instead: {e}")
+
+        if html is None:
+            context = await browser_pool.acquire_context()
+            try:
+                page = await context.new_page()
+                await page.goto(url, wait_until="networkidle", timeout=30000)
+                html = await page.content()
+            finally:
+                await context.close()
+
+        soup = BeautifulSoup(html, _HTML_PARSER)
 
         # Remove noise: nav, footer, scripts, styles
         for tag in soup(["script", "style", "nav", "footer", "aside"]):
@@ -51,21 +172,23 @@ async def scrape_page(url: str) -> ScrapeResult:
             or soup.body
         )
 
-        raw_html = str(main) if main else str(soup)
+        markdown = _md.convert_soup(main if main else soup)
 
-        # Convert to Markdown (much cheaper for LLM tokens)
-        markdown = md(raw_html, heading_style="ATX", bullets="-")
-
-        # Extract internal links for recursive scraping
-        base_domain = urlparse(url).netloc
+        # Extract internal links for recursive scraping — a strained
+        # re-parse materializes only the anchor nodes instead of walking
+        # the pruned content tree.
+        link_soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_LINK_STRAINER)
+        base_domain = urlsplit(url).netloc
+        seen: set[str] = set()
         child_urls = []
-        for a in soup.find_all("a", href=True):
+        for a in link_soup.find_all("a", href=True):
             href = urljoin(url, a["href"])
-            parsed = urlparse(href)
+            parsed = urlsplit(href)
             # Only follow links on the same domain, ignore anchors
             if parsed.netloc == base_domain and parsed.fragment == "":
                 clean = href.split("?")[0]  # strip query params
-                if clean != url and clean not in child_urls:
+                if clean != url and clean not in seen:
+                    seen.add(clean)
                     child_urls.append(clean)
 
         logger.info(f"Scraped {url}: {len(markdown)} chars, {len(child_urls)} links found")
@@ -76,31 +199,53 @@ async def scrape_page(url: str) -> ScrapeResult:
         return ScrapeResult(url=url, markdown="", error=str(e))
 
 
-async def scrape_docs(base_url: str, max_pages: int = 3) -> list[ScrapeResult]:
+async def scrape_docs(
+    base_url: str, max_pages: int = 3, concurrency: int = 5
+) -> list[ScrapeResult]:
     """
     Recursively scrape documentation pages up to max_pages.
-    Uses BFS (breadth-first) to prioritize top-level pages.
+    Uses BFS (breadth-first) to prioritize top-level pages; fetches run
+    concurrently, bounded by `concurrency`, and a new page starts as soon
+    as any slot frees — no waiting on the slowest page of a batch.
     """
     visited = set()
-    queue = [base_url]
+    # deque for O(1) pops; `queued` mirrors the deque so child-URL dedup is
+    # a set lookup instead of an O(n) scan of the queue.
+    queue = deque([base_url])
+    queued = {base_url}
     results = []
-
-    while queue and len(visited) < max_pages:
-        # Process up to 3 pages concurrently
-        batch = queue[:3]
-        queue = queue[3:]
-
-        tasks = [scrape_page(url) for url in batch if url not in visited]
-        batch_results = await asyncio.gather(*tasks)
-
-        for result in batch_results:
-            visited.add(result.url)
+    sem = asyncio.Semaphore(concurrency)
+    pending: set[asyncio.Task] = set()
+    started = 0
+
+    async def _bounded_scrape(url: str) -> ScrapeResult:
+        async with sem:
+            return await scrape_page(url)
+
+    while (queue and started < max_pages) or pending:
+        while queue and started < max_pages:
+            url = queue.popleft()
+            if url in visited:
+                continue
+            visited.add(url)
+            started += 1
+            pending.add(asyncio.create_task(_bounded_scrape(url)))
+
+        if not pending:
+            break
+
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            result = task.result()
             if not result.error:
                 results.append(result)
                 # Add new child URLs to queue
                 for child in result.child_urls:
-                    if child not in visited and child not in queue:
+                    if child not in visited and child not in queued:
                         queue.append(child)
+                        queued.add(child)
 
     logger.info(f"Scraping complete: {len(results)} pages scraped")
     return results
\ No newline at end of file
@@ -0,0 +1,15 @@
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "smart_devtool",
+    broker=settings.redis_url,
+    backend=settings.redis_url,
+)
+
+celery_app.conf.update(
+    task_time_limit=1800,  # hard-kill stuck scrape/LLM jobs after 30 min
+    worker_prefetch_multiplier=1,  # slow LLM tasks shouldn't starve peers
+    imports=("app.tasks.pipeline",),
+)
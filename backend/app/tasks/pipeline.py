@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from uuid import UUID
+
+import msgspec
+from sqlalchemy import insert
+
+from app.core.log_store import LogBuffer
+from app.core.redis import get_redis
+from app.models.project import APIEndpoint, Project, ProjectStatus
+from app.services.llm_parser import (
+    APISchema,
+    parse_documentation,
+    suggest_integration_paths,
+)
+from app.services.openapi import build_openapi_spec
+from app.services.scraper import browser_pool, close_http_client, scrape_docs
+from app.tasks import celery_app
+
+logger = logging.getLogger(__name__)
+
+RAW_CONTENT_LIMIT = 50_000
+
+LLM_CACHE_TTL = 86400
+
+# Below this row count a multi-VALUES INSERT is cheaper than setting up COPY
+COPY_THRESHOLD = 20
+
+_ENDPOINT_COPY_COLUMNS = [
+    "id",
+    "project_id",
+    "path",
+    "method",
+    "summary",
+    "description",
+    "parameters",
+    "request_body",
+    "response_schema",
+    "tags",
+]
+
+
+async def _insert_endpoints(db, rows: list[dict]):
+    """Bulk-insert endpoint rows.
+
+    Large batches go through asyncpg COPY (one protocol message regardless of
+    row count); small batches and non-asyncpg backends use a single
+    executemany INSERT.
+    """
+    if len(rows) >= COPY_THRESHOLD:
+        try:
+            # SAVEPOINT so a server-side COPY failure aborts only the nested
+            # transaction — without it the outer transaction would be left in
+            # a failed state and the INSERT fallback would raise instead.
+            async with db.begin_nested():
+                conn = await db.connection()
+                raw = await conn.get_raw_connection()
+                records = [
+                    (
+                        uuid.uuid4(),
+                        row["project_id"],
+                        row["path"],
+                        row["method"],
+                        row["summary"],
+                        row["description"],
+                        json.dumps(row["parameters"]),
+                        json.dumps(row["request_body"]),
+                        json.dumps(row["response_schema"]),
+                        json.dumps(row["tags"]),
+                    )
+                    for row in rows
+                ]
+                await raw.driver_connection.copy_records_to_table(
+                    "endpoints", records=records, columns=_ENDPOINT_COPY_COLUMNS
+                )
+            return
+        except Exception as e:
+            logger.warning(f"COPY insert failed, falling back to INSERT: {e}")
+    await db.execute(insert(APIEndpoint), rows)
+
+
+async def _cache_get(key: str) -> str | None:
+    try:
+        r = await get_redis()
+        raw = await r.get(key)
+        return raw.decode() if raw is not None else None
+    except Exception as e:
+        logger.warning(f"LLM cache read failed: {e}")
+        return None
+
+
+async def _cache_set(key: str, payload: str):
+    try:
+        r = await get_redis()
+        await r.set(key, payload, ex=LLM_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
+
+
+async def _parse_with_cache(combined_markdown: str, url: str, use_case: str) -> APISchema:
+    """Memoize parse_documentation on (url, docs, use_case) for 24h.
+
+    Re-scrapes of unchanged docs (other users, force_refresh) skip the LLM
+    entirely and rehydrate the schema from Redis.
+    """
+    key = "llm:parse:" + hashlib.sha256(
+        f"{url}|{use_case}|{combined_markdown}".encode()
+    ).hexdigest()
+    cached = await _cache_get(key)
+    if cached is not None:
+        return msgspec.json.decode(cached, type=APISchema)
+    api_schema = await parse_documentation(combined_markdown, base_url=url, use_case=use_case)
+    await _cache_set(key, msgspec.json.encode(api_schema).decode())
+    return api_schema
+
+
+async def _suggest_with_cache(api_schema: APISchema, use_case: str) -> list[dict]:
+    key = "llm:suggest:" + hashlib.sha256(
+        msgspec.json.encode(api_schema) + f"|{use_case}".encode()
+    ).hexdigest()
+    cached = await _cache_get(key)
+    if cached is not None:
+        return json.loads(cached)
+    suggestions = await suggest_integration_paths(api_schema, use_case)
+    await _cache_set(key, json.dumps(suggestions))
+    return suggestions
+
+
+def _combine_markdown(scrape_results, limit: int = RAW_CONTENT_LIMIT) -> str:
+    """Join scraped pages into one markdown doc, stopping at the size limit.
+
+    The limit counts UTF-8 bytes — what actually lands in the database —
+    rather than characters, and the doc is built incrementally so peak
+    memory is bounded by the limit, not the full concatenation of every
+    scraped page.
+    """
+    parts: list[str] = []
+    remaining = limit
+    for r in scrape_results:
+        piece = f"# Source: {r.url}\n\n{r.markdown}\n\n---\n\n"
+        encoded = piece.encode()
+        if len(encoded) >= remaining:
+            # errors="ignore" drops a multi-byte char split by the cut
+            parts.append(encoded[:remaining].decode("utf-8", errors="ignore"))
+            break
+        parts.append(piece)
+        remaining -= len(encoded)
+    return "".join(parts)
+
+
+@celery_app.task(
+    name="scrape_and_parse",
+    bind=True,
+    acks_late=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def scrape_and_parse(self, project_id: str, url: str, use_case: str = ""):
+    """Celery entrypoint — the pipeline itself is async, so run it on a fresh loop.
+
+    Failures propagate out of the job so autoretry_for reschedules the task
+    with exponential backoff; the project is only marked FAILED once the
+    last allowed attempt has been spent.
+    """
+    final_attempt = self.request.retries >= self.max_retries
+    asyncio.run(
+        run_scrape_and_parse_job(
+            UUID(project_id), url, use_case, final_attempt=final_attempt
+        )
+    )
+
+
+async def run_scrape_and_parse_job(
+    project_id: UUID, url: str, use_case: str = "", final_attempt: bool = True
+):
+    from app.core.database import worker_session
+
+    async with worker_session() as db, LogBuffer(str(project_id)) as logs:
+        project: Project | None = None
+        try:
+            project = await db.get(Project, project_id)
+            if project is None:
+                raise ValueError(f"Project {project_id} not found")
+
+            await logs.log("🔍 Starting documentation scrape...")
+            project.status = ProjectStatus.SCRAPING
+            await db.commit()
+            await logs.flush()
+
+            scrape_results = await scrape_docs(url, max_pages=3)
+            await logs.log(f"✅ Scraped {len(scrape_results)} page(s) successfully")
+
+            combined_markdown = _combine_markdown(scrape_results)
+
+            await logs.log("🧠 Analyzing documentation with AI...")
+            # One commit covers both the scraped content and the status flip
+            project.raw_content = combined_markdown
+            project.status = ProjectStatus.PARSING
+            await db.commit()
+            await logs.flush()
+
+            api_schema = await _parse_with_cache(combined_markdown, url, use_case)
+            await logs.log(f"📋 Discovered {len(api_schema.endpoints)} endpoint(s)")
+
+            await logs.log("💡 Generating integration path suggestions...")
+            # Depends only on api_schema — let the LLM call run while the
+            # results are written to the database.
+            suggestions_task = asyncio.create_task(
+                _suggest_with_cache(api_schema, use_case)
+            )
+
+            await logs.log("💾 Saving results to database...")
+            await logs.flush()
+            project.api_name = api_schema.api_name
+            project.api_description = api_schema.description
+            project.auth_scheme = msgspec.to_builtins(api_schema.auth)
+            project.use_case = use_case
+
+            rows = [
+                {
+                    "project_id": project.id,
+                    "path": ep.path,
+                    "method": ep.method.upper(),
+                    "summary": ep.summary,
+                    "description": ep.description,
+                    "parameters": msgspec.to_builtins(ep.parameters),
+                    "request_body": ep.request_body,
+                    "response_schema": ep.response_schema,
+                    "tags": ep.tags,
+                }
+                for ep in api_schema.endpoints
+            ]
+            if rows:
+                await _insert_endpoints(db, rows)
+
+            # Endpoint data is frozen from here on — precompute the OpenAPI
+            # export so GET /export is a single-row fetch.
+            project.openapi_spec = build_openapi_spec(
+                title=api_schema.api_name or project.name,
+                description=api_schema.description or "",
+                endpoints=rows,
+            )
+
+            project.integration_suggestions = await suggestions_task
+            project.status = ProjectStatus.COMPLETED
+            await db.commit()
+            await logs.log("🎉 Done! SDK ready for download.")
+            await logs.log("DONE")
+
+        except Exception as e:
+            logger.error(f"Pipeline failed for {project_id}: {e}", exc_info=True)
+            if not final_attempt:
+                # Keep the project in its in-progress state and the log
+                # stream open — Celery will retry this attempt.
+                await logs.log(f"⚠️ Error: {str(e)} — retrying...")
+                raise
+            await logs.log(f"❌ Error: {str(e)}")
+            await logs.log("FAILED")
+            # The project loaded at the top is still attached to the session —
+            # no need to re-fetch it. Guard the commit so a broken connection
+            # doesn't mask the original failure.
+            if project is not None:
+                try:
+                    await db.rollback()
+                    project.status = ProjectStatus.FAILED
+                    await db.commit()
+                except Exception as commit_error:
+                    logger.error(
+                        f"Failed to mark {project_id} FAILED: {commit_error}"
+                    )
+            raise
+        finally:
+            # This loop dies with the task (asyncio.run) — close the
+            # scraper's per-loop singletons now, or the Chromium/driver
+            # processes they hold outlive it and leak per job.
+            try:
+                await browser_pool.close()
+                await close_http_client()
+            except Exception as close_error:
+                logger.warning(f"Scraper cleanup failed: {close_error}")